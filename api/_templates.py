@@ -0,0 +1,24 @@
+# api/_templates.py
+"""Single Jinja2 environment shared by every HTML route."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+# Unset: Jinja's per-user "_jinja2-cache-<uid>" dir (mode 0700, owner-checked)
+JINJA_CACHE_DIR = os.environ.get("JINJA_CACHE_DIR")
+# Re-check template sources on every render (handy while editing templates)
+JINJA_AUTO_RELOAD = os.environ.get("JINJA_AUTO_RELOAD", "0") == "1"
+
+if JINJA_CACHE_DIR:
+    Path(JINJA_CACHE_DIR).mkdir(mode=0o700, parents=True, exist_ok=True)
+
+templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+# Compiled templates survive worker restarts instead of being re-parsed
+templates.env.bytecode_cache = FileSystemBytecodeCache(JINJA_CACHE_DIR)
+templates.env.auto_reload = JINJA_AUTO_RELOAD
@@ -0,0 +1,40 @@
+# api/caching.py
+"""HTTP caching helpers (ETag / conditional GET) shared by the routers."""
+
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def etag_response(
+    request: Request,
+    response: Response,
+    cache_control: str | None = None,
+    tag_source: bytes | None = None,
+) -> Response:
+    """
+    Tag *response* with a strong ``ETag`` derived from its rendered body.
+
+    Pass *tag_source* to derive the tag from other bytes instead (e.g. the
+    body minus a timestamp); the tag is then weak, since equal tags no longer
+    promise identical bodies.
+
+    If the client's ``If-None-Match`` already names that tag, an empty
+    ``304 Not Modified`` is returned in place of *response*.
+    """
+    source = response.body if tag_source is None else tag_source
+    opaque = f'"{hashlib.blake2b(source, digest_size=8).hexdigest()}"'
+    etag = opaque if tag_source is None else f"W/{opaque}"
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if opaque in tags or "*" in tags:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return response
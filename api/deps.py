@@ -0,0 +1,39 @@
+# api/deps.py
+"""FastAPI dependencies shared by every router (one object per dependency)."""
+
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import HTTPException, Request, status
+
+from core.database import SessionLocal
+from core.driver.mkswifi import MKSPrinter
+
+
+# Dependency  – one DB session / request
+async def get_db():
+    async with SessionLocal() as db:
+        yield db
+
+
+def get_resources(request: Request) -> tuple[MKSPrinter, asyncio.Lock]:
+    """
+    Fetch the shared ``(printer, lock)`` created in main.py.
+
+    Returns
+    -------
+    (MKSPrinter, asyncio.Lock)
+
+    Raises
+    ------
+    HTTPException(503) if startup failed.
+    """
+    printer: MKSPrinter | None = getattr(request.app.state, "printer", None)
+    lock: asyncio.Lock | None = getattr(request.app.state, "printer_lock", None)
+    if printer is None or lock is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Printer not connected",
+        )
+    return printer, lock
@@ -1,87 +1,169 @@
-from typing import Dict, Any
+from typing import Any, Awaitable, Callable, Dict
 import asyncio
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session
+import time
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import State
 
-from core.database import SessionLocal
 from core import crud, schemas
 
 from core.driver.mkswifi import MKSPrinter
 
-router = APIRouter(prefix="/api/v1/printers", tags=["api.v1, printers"])
+from api.caching import etag_response
+from api.deps import get_db
 
-# Dependency  – one DB session / request
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+router = APIRouter(prefix="/api/v1/printers", tags=["api.v1, printers"])
 
 @router.post("/", response_model=schemas.PrinterOut, status_code=201)
-def create(data: schemas.PrinterCreate, db: Session = Depends(get_db)):
-    return crud.create_printer(db, data)
+async def create(data: schemas.PrinterCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.create_printer(db, data)
+
+@router.post("/bulk", response_model=list[schemas.PrinterOut], status_code=201)
+async def create_bulk(data: list[schemas.PrinterCreate], db: AsyncSession = Depends(get_db)):
+    return await crud.create_printers_bulk(db, data)
 
 @router.get("/", response_model=list[schemas.PrinterOut])
-def read_all(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.list_printers(db, skip, limit)
+async def read_all(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
+    return await crud.list_printers(db, skip, limit)
 
 @router.get("/{pid}", response_model=schemas.PrinterOut)
-def read_one(pid: int, db: Session = Depends(get_db)):
-    db_item = crud.get_printer(db, pid)
+async def read_one(pid: int, db: AsyncSession = Depends(get_db)):
+    db_item = await crud.get_printer(db, pid)
     if not db_item:
         raise HTTPException(404, detail="Printer not found")
     return db_item
 
 @router.put("/{pid}", response_model=schemas.PrinterOut)
-def update(pid: int, data: schemas.PrinterUpdate, db: Session = Depends(get_db)):
-    db_item = crud.get_printer(db, pid)
+async def update(pid: int, data: schemas.PrinterUpdate, request: Request,
+                 db: AsyncSession = Depends(get_db)):
+    db_item = await crud.get_printer(db, pid)
     if not db_item:
         raise HTTPException(404, detail="Printer not found")
-    return crud.update_printer(db, db_item, data)
+    db_item = await crud.update_printer(db, db_item, data)
+    await _forget_printer(request, pid)
+    return db_item
 
 @router.delete("/{pid}", status_code=204)
-def delete(pid: int, db: Session = Depends(get_db)):
-    db_item = crud.get_printer(db, pid)
+async def delete(pid: int, request: Request, db: AsyncSession = Depends(get_db)):
+    db_item = await crud.get_printer(db, pid)
     if not db_item:
         raise HTTPException(404, detail="Printer not found")
-    crud.delete_printer(db, db_item)
+    await crud.delete_printer(db, db_item)
+    await _forget_printer(request, pid)
 
 # ---------------------------------------------------------------------------
-# Dependency helpers
+# Per-row printer connections – keeps the DB off the status hot path
 # ---------------------------------------------------------------------------
 
-def _get_resources(request: Request) -> tuple[MKSPrinter, asyncio.Lock]:
+async def _printer_for(request: Request, db: AsyncSession, pid: int) -> MKSPrinter:
     """
-    Fetch the shared ``(printer, lock)`` created in main.py.
+    Return the dedicated :class:`MKSPrinter` for row *pid*.
 
-    Returns
-    -------
-    (MKSPrinter, asyncio.Lock)
+    The row is read from the DB only on first use; afterwards the client is
+    served from ``app.state.printer_cache`` until the row changes.
+    """
+    state = request.app.state
+    cache: dict[int, tuple[str, int, MKSPrinter]] = state.printer_cache
+    while (hit := cache.get(pid)) is None:
+        generation = state.printer_evictions.get(pid, 0)
+        row = await crud.get_printer(db, pid)
+        if not row:
+            raise HTTPException(404, detail="Printer not found")
+        if state.printer_evictions.get(pid, 0) != generation:
+            # updated/deleted while we were reading: the row may be stale,
+            # end the read transaction and look again
+            await db.rollback()
+            continue
+        # setdefault: a concurrent miss may have filled the slot meanwhile
+        hit = cache.setdefault(
+            pid, (row.ip_address, row.port, MKSPrinter(row.ip_address, row.port))
+        )
+    return hit[2]
+
+async def _forget_printer(request: Request, pid: int) -> None:
+    """Drop the cached client and snapshot of *pid* after an update/delete.
 
-    Raises
-    ------
-    HTTPException(503) if startup failed.
+    An in-flight poll is cancelled first so it can neither reconnect the
+    evicted client nor write its (old host's) snapshot back into the cache.
     """
-    printer: MKSPrinter | None = getattr(request.app.state, "printer", None)
-    lock: asyncio.Lock | None = getattr(request.app.state, "printer_lock", None)
-    if printer is None or lock is None:
+    state = request.app.state
+    state.printer_evictions[pid] = state.printer_evictions.get(pid, 0) + 1
+    state.status_cache.pop(pid, None)
+    task = state.status_inflight.pop(pid, None)
+    if task is not None:
+        task.cancel()
+        await asyncio.wait({task})
+    hit = state.printer_cache.pop(pid, None)
+    if hit is not None:
+        await hit[2].close()
+
+# ---------------------------------------------------------------------------
+# Status cache – collapse concurrent pollers into one printer round-trip
+# ---------------------------------------------------------------------------
+
+STATUS_TTL: float = 1.0  # seconds a snapshot is reused before re-polling
+
+def _store_status(state: State, pid: int, task: asyncio.Task) -> None:
+    if state.status_inflight.get(pid) is not task:
+        return  # evicted by _forget_printer meanwhile: result is stale
+    del state.status_inflight[pid]
+    if not task.cancelled() and task.exception() is None:
+        state.status_cache[pid] = (time.monotonic(), task.result())
+
+async def _cached_status(
+    state: State,
+    pid: int,
+    resolve: Callable[[], Awaitable[MKSPrinter]],
+    fetch: Callable[[MKSPrinter], Awaitable[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """
+    Return the snapshot of printer *pid*, calling *fetch* at most once per
+    ``STATUS_TTL`` window.
+
+    Callers arriving while a fetch is in flight await that same fetch
+    (single-flight), so each printer only ever sees one poll at a time.
+    Both maps live in ``app.state`` (``status_cache`` / ``status_inflight``).
+    The client is obtained from *resolve* right before a new fetch starts, so
+    a client evicted in the meantime is never polled.
+    """
+    hit = state.status_cache.get(pid)
+    if hit and time.monotonic() - hit[0] < STATUS_TTL:
+        return hit[1]
+
+    task = state.status_inflight.get(pid)
+    while task is None:
+        client = await resolve()
+        task = state.status_inflight.get(pid)  # started while we resolved?
+        if task is not None:
+            break
+        held = state.printer_cache.get(pid)
+        if held is None or held[2] is not client:
+            continue  # evicted while resolving: pick up the new client
+        task = asyncio.create_task(fetch(client))
+        task.add_done_callback(lambda t: _store_status(state, pid, t))
+        state.status_inflight[pid] = task
+    # wait() rather than await: a disconnecting client must not cancel the
+    # shared fetch
+    await asyncio.wait({task})
+    if task.cancelled():
         raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Printer not connected",
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Printer was updated or deleted while polling",
         )
-    return printer, lock
+    return task.result()
 
 @router.get(
     "/{pid}/status",
     response_model=Dict[str, Any]
 )
 async def printer_status(
-    pid: int, db: Session = Depends(get_db),
-    resources: tuple[MKSPrinter, asyncio.Lock] = Depends(_get_resources),
-) -> Dict[str, Any]:
+    pid: int, request: Request, db: AsyncSession = Depends(get_db),
+) -> Response:
     """
-    Current printer snapshot in JSON.
+    Current printer snapshot in JSON, tagged with an ``ETag``; unchanged
+    snapshots are answered with ``304 Not Modified``.
 
     The structure mirrors :py:meth:`core.driver.mkswifi.MKSPrinter.poll`::
 
@@ -94,17 +176,24 @@ async def printer_status(
           "stamp":   "2025-05-06T11:32:10"
         }
     """
-    mksprinter, lock = resources
-    async with lock:
+    async def fetch(mksprinter: MKSPrinter) -> Dict[str, Any]:
         try:
-            printer = crud.get_printer(db, pid)
-            mksprinter.host = printer.ip_address
-            mksprinter.port = printer.port
-            fresh = await mksprinter.poll()
+            fresh = await mksprinter.poll(seconds=0)  # no settle delay on the request path
         except Exception as exc:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=str(exc),
             ) from exc
-
-    return fresh or printer.latest
+        return fresh or mksprinter.latest
+
+    snapshot = await _cached_status(
+        request.app.state, pid, lambda: _printer_for(request, db, pid), fetch
+    )
+    return etag_response(
+        request,
+        Response(orjson.dumps(snapshot), media_type="application/json"),
+        cache_control="max-age=1, stale-while-revalidate=5",
+        # "stamp" changes every poll; tag the readings only so an idle
+        # printer keeps answering 304
+        tag_source=orjson.dumps({k: v for k, v in snapshot.items() if k != "stamp"}),
+    )
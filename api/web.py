@@ -4,78 +4,133 @@
 from __future__ import annotations
 
 import asyncio
-from pathlib import Path
 from typing import Dict, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
-from core.database import SessionLocal
+import orjson
+
+from fastapi import (APIRouter, Depends, FastAPI, Request, WebSocket,
+                     WebSocketDisconnect)
+from fastapi.responses import HTMLResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from core import crud
 
 from core.driver.mkswifi import MKSPrinter
 
-router = APIRouter()
-templates = Jinja2Templates(directory=str(Path(__file__).parent.parent / "templates"))
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from api._templates import templates
+from api.caching import etag_response
+from api.deps import get_db, get_resources
 
-# ---------------------------------------------------------------------------
-# Dependency: reuse the helpers from api.routes
-# ---------------------------------------------------------------------------
-from api.printers import _get_resources   # pylint: disable=wrong-import-position
+router = APIRouter()
 
 @router.get("/", response_class=HTMLResponse, tags=["Frontend"], name="live_status")
 async def dashboard(
     request: Request,
-    resources: tuple[MKSPrinter, asyncio.Lock] = Depends(_get_resources),
+    resources: tuple[MKSPrinter, asyncio.Lock] = Depends(get_resources),
 ) -> HTMLResponse:
     """
-    Render an HTML dashboard (Jinja template) with the latest printer data.
-    The template also loads JS that re-polls the **/printer/status** JSON
-    endpoint every few seconds and updates the DOM.
+    Render an HTML dashboard (Jinja template) with the last polled snapshot.
+    The template also loads JS that subscribes to **/ws/status** (or
+    **/events/status** as a fallback) and updates the DOM on every push.
     """
-    printer, lock = resources
-    async with lock:
+    printer, _lock = resources
+    # Kept fresh by the background poller; no printer round-trip on render
+    snapshot: Dict[str, Any] = printer.latest or {}
+
+    return etag_response(
+        request,
+        templates.TemplateResponse(
+            "status.html",
+            {
+                "request": request,   # mandatory for Jinja2Templates
+                "data": snapshot,
+            },
+        ),
+        # the page is only a shell; live data arrives over /ws/status
+        cache_control="public, max-age=5, stale-while-revalidate=30",
+    )
+
+# ---------------------------------------------------------------------------
+# Live status push (fed by the poller started in main.py)
+# ---------------------------------------------------------------------------
+
+def _subscribe(app: FastAPI) -> asyncio.Queue:
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    app.state.status_subscribers.add(queue)
+    return queue
+
+def _unsubscribe(app: FastAPI, queue: asyncio.Queue) -> None:
+    app.state.status_subscribers.discard(queue)
+
+@router.websocket("/ws/status", name="status_ws")
+async def status_ws(websocket: WebSocket) -> None:
+    """Send the latest snapshot, then every new one, as JSON messages."""
+    await websocket.accept()
+    queue = _subscribe(websocket.app)
+    # Listen for the close frame too: while the printer is offline no
+    # snapshot arrives, and a closed tab must not stay subscribed.
+    incoming = asyncio.create_task(websocket.receive())
+    update: asyncio.Task | None = None
+    try:
+        snapshot = websocket.app.state.printer.latest
+        while True:
+            if snapshot:
+                await websocket.send_text(orjson.dumps(snapshot).decode())
+            snapshot = None
+            update = asyncio.create_task(queue.get())
+            await asyncio.wait({incoming, update}, return_when=asyncio.FIRST_COMPLETED)
+            if incoming.done():
+                if incoming.result()["type"] == "websocket.disconnect":
+                    break
+                incoming = asyncio.create_task(websocket.receive())  # ignore client chatter
+            if update.done():
+                snapshot = update.result()
+            else:
+                update.cancel()
+    except (WebSocketDisconnect, RuntimeError):
+        pass  # client went away
+    finally:
+        incoming.cancel()
+        if update is not None:
+            update.cancel()
+        _unsubscribe(websocket.app, queue)
+
+@router.get("/events/status", tags=["Frontend"], name="status_events")
+async def status_events(request: Request) -> StreamingResponse:
+    """Server-Sent-Events fallback for clients that cannot open a WebSocket."""
+    async def stream():
+        queue = _subscribe(request.app)
         try:
-            snapshot: Dict[str, Any] = await printer.poll()
-        except Exception as exc:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=str(exc),
-            ) from exc
-
-    if not snapshot:
-        snapshot = printer.latest or {}
-
-    return templates.TemplateResponse(
-        "status.html",
-        {
-            "request": request,   # mandatory for Jinja2Templates
-            "data": snapshot,
-        },
+            snapshot = request.app.state.printer.latest
+            while True:
+                if snapshot:
+                    yield b"data: " + orjson.dumps(snapshot) + b"\n\n"
+                snapshot = await queue.get()
+        finally:
+            _unsubscribe(request.app, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
     )
 
 @router.get("/printers", response_class=HTMLResponse, tags=["Frontend"], name="printers")
-def printer_page(request: Request, db: Session = Depends(get_db)):
-    printers = crud.list_printers(db)
-    return templates.TemplateResponse("printers.html", {"request": request,
-                                                        "printers": printers})
+async def printer_page(request: Request, db: AsyncSession = Depends(get_db)):
+    printers = await crud.list_printers(db)
+    return etag_response(request, templates.TemplateResponse(
+        "printers.html", {"request": request, "printers": printers}))
 
 @router.get("/history", response_class=HTMLResponse, tags=["Frontend"], name="history")
 async def history(request: Request):
-    return templates.TemplateResponse("history.html", {"request": request})
+    return etag_response(request, templates.TemplateResponse(
+        "history.html", {"request": request}))
 
 @router.get("/files", response_class=HTMLResponse, tags=["Frontend"], name="files")
 async def files(request: Request):
-    return templates.TemplateResponse("files.html", {"request": request})
+    return etag_response(request, templates.TemplateResponse(
+        "files.html", {"request": request}))
 
 @router.get("/settings", response_class=HTMLResponse, tags=["Frontend"], name="settings")
 async def settings(request: Request):
-    return templates.TemplateResponse("settings.html", {"request": request})
+    return etag_response(request, templates.TemplateResponse(
+        "settings.html", {"request": request}))
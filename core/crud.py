@@ -1,27 +1,39 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from . import models, schemas
 
-def get_printer(db: Session, printer_id: int) -> models.Printer:
-    return db.query(models.Printer).get(printer_id)
+async def get_printer(db: AsyncSession, printer_id: int) -> models.Printer:
+    return await db.get(models.Printer, printer_id)
 
-def list_printers(db: Session, skip: int = 0, limit: int = 100) -> List[models.Printer]:
-    return db.query(models.Printer).offset(skip).limit(limit).all()
+async def list_printers(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[models.Printer]:
+    result = await db.scalars(select(models.Printer).offset(skip).limit(limit))
+    return list(result.all())
 
-def create_printer(db: Session, data: schemas.PrinterCreate):
-    item = models.Printer(**data.dict())
+async def create_printer(db: AsyncSession, data: schemas.PrinterCreate):
+    item = models.Printer(**data.model_dump())
     db.add(item)
-    db.commit()
-    db.refresh(item)
+    await db.commit()
+    await db.refresh(item)
     return item
 
-def update_printer(db: Session, db_item: models.Printer, data: schemas.PrinterUpdate):
+async def create_printers_bulk(db: AsyncSession, datas: List[schemas.PrinterCreate]) -> List[models.Printer]:
+    # one INSERT ... RETURNING for the whole batch, one commit
+    if not datas:
+        return []
+    stmt = insert(models.Printer).returning(models.Printer, sort_by_parameter_order=True)
+    result = await db.scalars(stmt, [d.model_dump() for d in datas])
+    items = list(result.all())
+    await db.commit()
+    return items
+
+async def update_printer(db: AsyncSession, db_item: models.Printer, data: schemas.PrinterUpdate):
     for k, v in data.model_dump(exclude_unset=True).items():
         setattr(db_item, k, v)
-    db.commit()
-    db.refresh(db_item)
+    await db.commit()
+    await db.refresh(db_item)
     return db_item
 
-def delete_printer(db: Session, db_item: models.Printer):
-    db.delete(db_item)
-    db.commit()
+async def delete_printer(db: AsyncSession, db_item: models.Printer):
+    await db.delete(db_item)
+    await db.commit()
@@ -1,17 +1,32 @@
-from sqlalchemy import create_engine
+from sqlalchemy import event
 import os
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-DATABASE_URL = "sqlite:///./data/printers.db"          # ← local file, no server needed
+DATABASE_URL = "sqlite+aiosqlite:///./data/printers.db"  # ← local file, no server needed
 newpath = r'./data'                 # ← path to the database file
 if not os.path.exists(newpath):
     os.makedirs(newpath)
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+engine = create_async_engine(
+    DATABASE_URL,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=20,           # connections kept open
+    max_overflow=10,        # extra connections allowed under bursts
+    pool_timeout=30,        # seconds to wait for a free connection
+    pool_pre_ping=True,     # drop dead connections before handing them out
+    pool_recycle=3600,      # reopen connections older than an hour
 )
 
+@event.listens_for(engine.sync_engine, "connect")
+def _sqlite_pragmas(dbapi_connection, _connection_record):
+    # WAL lets readers proceed while a writer holds the lock
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
 class Base(DeclarativeBase):
     pass
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
@@ -19,7 +19,10 @@ Fixes & improvements over the earlier prototype
   optional whitespace.
 * Streaming file upload (`upload_gcode`) now reads the file **line-by-line**
   instead of loading the entire file in memory and stops cleanly on error.
+  Lines are pipelined in windows so acknowledgements overlap the transfer.
 * Added helper methods for starting, pausing and aborting prints.
+* The TCP connection is kept open between calls and transparently re-opened
+  (with exponential back-off) when the Wi-Fi module drops it.
 * All public methods raise meaningful exceptions and write structured debug
   output via `logging`.
 
@@ -32,7 +35,6 @@ with `ok` first, followed by an optional information line.
 from __future__ import annotations
 
 import asyncio
-import datetime as dt
 import logging
 import re
 import time
@@ -51,24 +53,35 @@ logger.addHandler(logging.NullHandler())
 # Pre-compiled regular expressions for parsing Wi-Fi replies
 # ---------------------------------------------------------------------------
 
-TEMP_RE = re.compile(
-    r'T:\s*(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?).*?B:\s*(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)'
+# One pass over all poll() replies; ``match.lastgroup`` tells which frame hit.
+STATUS_RE: Final = re.compile(
+    r"T:\s*(?P<T>\d+(?:\.\d+)?)\s*/\s*(?P<Tset>\d+(?:\.\d+)?)"
+    r".*?B:\s*(?P<B>\d+(?:\.\d+)?)\s*/\s*(?P<Bset>\d+(?:\.\d+)?)"
+    r"|^M994\s+(?P<job>[^;\n]+);\d+\s*$"
+    r"|M27\s+(?P<progress>\d+)"
+    r"|M992\s+(?P<elapsed>[\d:]+)"
+    r"|M997\s+(?P<state>\w+)",
+    re.MULTILINE,
 )
-PROG_RE: Final = re.compile(r"M27\s+(\d+)")
-TIME_RE: Final = re.compile(r"M992\s+([\d:]+)")
-STATE_RE: Final = re.compile(r"M997\s+(\w+)")
-FILENAME_RE: Final = re.compile(r'^M994\s+([^;]+);(\d+)\s*\r?\n?$')
 
 
 class MKSPrinter:
     """Async client for the MKS Wi-Fi (TCP) protocol."""
 
+    RECONNECT_BASE: Final = 0.5  # first back-off delay (seconds)
+    RECONNECT_CAP: Final = 10.0  # longest back-off delay (seconds)
+
     def __init__(self, host: str, port: int = 8080, *, read_timeout: float = 5.0):
         self.host, self.port = host, port
         self.reader: Optional[asyncio.StreamReader] = None
         self.writer: Optional[asyncio.StreamWriter] = None
         self.read_timeout = read_timeout
         self.latest: dict[str, object] = {}
+        self._last_stamp_sec: int = -1
+        self._last_stamp_str: str = ""
+        self._healthy = False  # False until connected / after an I/O error
+        self._closed = False   # close() called: no automatic reconnects
+        self._failures = 0     # consecutive failed reconnects (drives back-off)
 
     class GCodes(str, Enum):
         """Minimal set of G-codes understood by the MKS Wi-Fi firmware."""
@@ -89,6 +102,13 @@ class MKSPrinter:
 
         SWITCH_FS = "M998"  # Toggle SD ⟷ USB
 
+    # Wire form of every fixed (non-template) G-code, encoded once at import.
+    # ``str`` members hash and compare like their value, so both
+    # ``GCodes.STATE`` and ``"M997"`` hit the same entry.
+    _wire_bytes: Final[dict[str, bytes]] = {
+        g.value: f"{g.value}\r\n".encode() for g in GCodes if "{" not in g.value
+    }
+
     # ---------------------------------------------------------------------
     # Async context manager helpers
     # ---------------------------------------------------------------------
@@ -106,31 +126,89 @@ class MKSPrinter:
 
     async def connect(self) -> None:
         """Open a TCP connection to the Wi-Fi module."""
-        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.read_timeout
+        )
+        self._healthy = True
+        self._closed = False
         logger.debug("Connected to %s:%s", self.host, self.port)
 
     async def close(self) -> None:
-        """Close the TCP connection (if open)."""
-        if self.writer:
-            self.writer.close()
-            await self.writer.wait_closed()
+        """Close the TCP connection (if open) until :py:meth:`connect` is called."""
+        self._closed = True
+        await self._disconnect()
+
+    async def _disconnect(self) -> None:
+        writer, self.reader, self.writer = self.writer, None, None
+        self._healthy = False
+        if writer:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass  # peer already reset the connection
             logger.debug("Connection closed")
 
+    async def _reconnect(self) -> None:
+        """Re-open the connection, backing off after repeated failures.
+
+        Each call makes a single attempt; the delay before it doubles with
+        every consecutive failure (``RECONNECT_BASE`` up to ``RECONNECT_CAP``)
+        so an offline module is not hammered by every caller.
+        """
+        await self._disconnect()
+        if self._failures:
+            await asyncio.sleep(
+                min(self.RECONNECT_CAP, self.RECONNECT_BASE * 2 ** (self._failures - 1))
+            )
+        try:
+            await self.connect()
+        except (OSError, asyncio.TimeoutError):
+            self._failures += 1
+            raise
+        self._failures = 0
+
+    async def _write(self, payloads: list[bytes]) -> None:
+        """Write *payloads* with one drain, reconnecting and retrying once."""
+        for retry in (False, True):
+            if self._closed:
+                raise RuntimeError("Not connected")
+            if not self._healthy or not self.writer or self.writer.is_closing():
+                await self._reconnect()
+            try:
+                self.writer.writelines(payloads)
+                await self.writer.drain()
+                return
+            except (ConnectionResetError, BrokenPipeError) as exc:
+                self._healthy = False
+                if retry:
+                    raise
+                logger.warning("Connection to %s:%s lost (%s), reconnecting",
+                               self.host, self.port, exc)
+
     # ---------------------------------------------------------------------
     # Low-level I/O helpers
     # ---------------------------------------------------------------------
 
+    def _encode(self, gcode: GCodes) -> bytes:
+        return self._wire_bytes.get(gcode) or f"{gcode.strip()}\r\n".encode()
+
     async def _send_raw(self, gcode: GCodes) -> None:
-        if not self.writer:
-            raise RuntimeError("Not connected")
-        logger.debug(">> %s", gcode.strip())
-        self.writer.write(f"{gcode.strip()}\r\n".encode())
-        await self.writer.drain()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(">> %s", gcode.strip())
+        await self._write([self._encode(gcode)])
 
     async def _read_raw(self) -> str:
         if not self.reader:
             raise RuntimeError("Not connected")
-        raw = await asyncio.wait_for(self.reader.readline(), self.read_timeout)
+        try:
+            raw = await asyncio.wait_for(self.reader.readline(), self.read_timeout)
+        except ConnectionResetError:
+            self._healthy = False
+            raise
+        if not raw:
+            self._healthy = False  # EOF: module closed the connection
+            raise ConnectionResetError("Connection closed by printer")
         text = raw.decode(errors="ignore").strip()
         logger.debug("<< %s", text)
         return text
@@ -139,6 +217,7 @@ class MKSPrinter:
         """Return the first payload line (skipping leading 'ok')."""
         first = await self._read_raw()
         if first.lower().startswith("error"):
+            self._healthy = False  # drop whatever else is still in flight
             raise RuntimeError(first)
 
         if first == "ok":
@@ -148,62 +227,160 @@ class MKSPrinter:
                 if second and second != "ok":
                     return second
                 return ""  # Command with no additional payload
-            except asyncio.TimeoutError:
-                return ""
+            except (asyncio.TimeoutError, ConnectionResetError):
+                return ""  # already acknowledged; any payload is lost
         return first  # Some commands may reply without the leading ok
 
-    async def send(self, gcode: GCodes) -> str:
-        """Send *gcode* and return the payload line (empty if none)."""
-        await self._send_raw(gcode.strip())
+    async def _send_many(self, gcodes: list[GCodes]) -> None:
+        """Write every command in *gcodes* back-to-back with a single drain."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(">> %s", " | ".join(g.strip() for g in gcodes))
+        await self._write([self._encode(g) for g in gcodes])
+
+    async def _read_n_responses(self, n: int) -> list[str]:
+        """Read the payloads of *n* pipelined commands, in order.
+
+        Replies are pulled in chunks of up to 4 KiB and split locally instead
+        of one ``readline()`` per line; a chunk that ends mid-line is
+        completed with ``readuntil``. Every reply starts with an ``ok`` line
+        (possibly carrying the payload itself, as ``M105`` does).
+        """
+        if not self.reader:
+            raise RuntimeError("Not connected")
+
+        replies: list[list[str]] = []
+        timed_out = False
+        while not timed_out and (len(replies) < n or (replies and not replies[-1])):
+            try:
+                data = await asyncio.wait_for(self.reader.read(4096), self.read_timeout)
+                if data and not data.endswith(b"\n"):
+                    try:
+                        data += await asyncio.wait_for(
+                            self.reader.readuntil(b"\n"), self.read_timeout
+                        )
+                    except asyncio.IncompleteReadError as exc:
+                        data += exc.partial
+                    except asyncio.TimeoutError:
+                        timed_out = True  # keep the complete lines already read
+            except asyncio.TimeoutError:
+                timed_out = True
+                data = b""
+            except ConnectionResetError:
+                self._healthy = False
+                raise
+            if timed_out:
+                # late replies would be read as the next exchange's: reconnect
+                self._healthy = False
+            if not data:
+                if timed_out:
+                    break
+                self._healthy = False  # EOF: reconnect on the next write
+                if not replies:
+                    raise ConnectionResetError("Connection closed by printer")
+                break
+
+            for raw in data.split(b"\n"):
+                text = raw.decode(errors="ignore").strip()
+                if not text:
+                    continue
+                logger.debug("<< %s", text)
+                if text.lower().startswith("error"):
+                    self._healthy = False  # unread replies stay buffered
+                    raise RuntimeError(text)
+                if text[:2].lower() == "ok":
+                    replies.append([])
+                    text = text[2:].strip()
+                elif not replies:
+                    replies.append([])  # reply without the leading ok
+                if text:
+                    replies[-1].append(text)
+
+        if timed_out and len(replies) < n:
+            logger.warning("Timeout after %d/%d pipelined replies", len(replies), n)
+        # (a timeout with all n replies started only misses an optional payload)
+        payloads = ["\n".join(lines) for lines in replies[:n]]
+        payloads.extend("" for _ in range(n - len(payloads)))
+        return payloads
+
+    async def _pipeline(self, gcodes: list[GCodes]) -> list[str]:
+        """Send *gcodes* in one burst and return one payload per command.
+
+        Saves one network round-trip per extra command compared to calling
+        :py:meth:`send` in a loop.
+        """
+        await self._send_many(gcodes)
+        try:
+            return await self._read_n_responses(len(gcodes))
+        except ConnectionResetError:
+            # link died before the module answered: replay once on a new one
+            await self._send_many(gcodes)
+            return await self._read_n_responses(len(gcodes))
+
+    async def _exchange(self, gcode: GCodes) -> str:
+        await self._send_raw(gcode)
         try:
             return await self._read_response()
         except asyncio.TimeoutError:
+            self._healthy = False  # a late reply must not answer the next command
             logger.warning("Timeout while waiting for reply to %s", gcode.strip())
             return ""
 
+    async def send(self, gcode: GCodes) -> str:
+        """Send *gcode* and return the payload line (empty if none).
+
+        If the module drops the link before answering, the command is
+        replayed once on a fresh connection; a second drop is raised.
+        """
+        try:
+            return await self._exchange(gcode)
+        except ConnectionResetError:
+            logger.warning("Connection to %s:%s lost before reply to %s, resending",
+                           self.host, self.port, gcode.strip())
+        return await self._exchange(gcode)
+
     # ---------------------------------------------------------------------
     # High-level helpers
     # ---------------------------------------------------------------------
 
+    def _stamp(self) -> str:
+        """Local ISO-8601 time (seconds precision), formatted once per second."""
+        now = int(time.time())
+        if now != self._last_stamp_sec:
+            self._last_stamp_sec = now
+            self._last_stamp_str = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now))
+        return self._last_stamp_str
+
     async def poll(self, seconds: float = 0.5) -> dict[str, object]:
         """Retrieve temperatures, progress, elapsed time and state."""
         fresh: dict[str, object] = {}
 
-        await self.connect()
-
-        temp = await self.send(self.GCodes.TEMP_QUERY)
-        jobn = await self.send(self.GCodes.FILENAME)
-        prog = await self.send(self.GCodes.PROGRESS)
-        elap = await self.send(self.GCodes.ELAPSED)
-        stat = await self.send(self.GCodes.STATE)
-
-        await self.close()
-
-        if m := TEMP_RE.search(temp):
-            fresh["temps"] = {
-                "T": float(m[1]),
-                "Tset": float(m[2]),
-                "B": float(m[3]),
-                "Bset": float(m[4]),
-            }
-
-        if m := PROG_RE.search(prog):
-            fresh["progress"] = int(m[1])
-
-        if m := FILENAME_RE.search(jobn):
-            fresh["job"] = m[1]
-
-        if m := TIME_RE.search(elap):
-            fresh["elapsed"] = m[1]
-
-        if m := STATE_RE.search(stat):
-            fresh["state"] = m[1]
+        replies = await self._pipeline([
+            self.GCodes.TEMP_QUERY,
+            self.GCodes.FILENAME,
+            self.GCodes.PROGRESS,
+            self.GCodes.ELAPSED,
+            self.GCodes.STATE,
+        ])
+
+        for m in STATUS_RE.finditer("\n".join(replies)):
+            kind = m.lastgroup
+            if kind == "Bset":
+                fresh["temps"] = {
+                    "T": float(m["T"]),
+                    "Tset": float(m["Tset"]),
+                    "B": float(m["B"]),
+                    "Bset": float(m["Bset"]),
+                }
+            elif kind == "progress":
+                fresh["progress"] = int(m["progress"])
+            else:
+                fresh[kind] = m[kind]
 
         if fresh:
-            fresh["stamp"] = dt.datetime.now().isoformat(timespec="seconds")
+            fresh["stamp"] = self._stamp()
             self.latest = fresh
 
-        time.sleep(seconds)
+        await asyncio.sleep(seconds)
 
         return fresh
 
@@ -211,26 +388,90 @@ class MKSPrinter:
     # SD/USB file helpers
     # ---------------------------------------------------------------------
 
-    async def upload_gcode(self, path: Path) -> None:
-        """Upload *path* to the printer via M28/M29."""
+    async def _read_acks(self, n: int) -> None:
+        """Consume *n* acknowledgement lines, raising on the first error.
+
+        The whole window is consumed even after an error so the next command
+        is not answered by a leftover ack.
+        """
+        error = ""
+        acked = 0
+        while acked < n:
+            try:
+                ack = await self._read_raw()
+            except asyncio.TimeoutError:
+                self._healthy = False  # acks still in flight: stream is out of step
+                raise
+            except ConnectionResetError as exc:
+                raise RuntimeError("Connection lost during upload") from exc
+            if not ack:
+                continue  # stray blank line, not an ack
+            acked += 1
+            if not error and ack.lower().startswith("error"):
+                error = ack
+        if error:
+            raise RuntimeError(error)
+
+    async def _flush_window(self, lines: list[bytes]) -> None:
+        """Write one upload window in a single call, then wait for its acks."""
+        # No reconnect here: a new connection would not be inside the M28 session
+        if not self._healthy or not self.writer:
+            raise RuntimeError("Connection lost during upload")
+        self.writer.writelines(lines)
+        await self.writer.drain()
+        await self._read_acks(len(lines))
+
+    async def upload_gcode(self, path: Path, *, window: int = 16) -> None:
+        """Upload *path* to the printer via M28/M29.
+
+        Lines are streamed *window* at a time: a whole window is written
+        before its acknowledgements are read, so the transfer is not bound
+        by one network round-trip per line.
+        """
         if not path.is_file():
             raise FileNotFoundError(path)
+        if window < 1:
+            raise ValueError("window must be >= 1")
 
         # Open file on printer for writing
         ack = await self.send(self.GCodes.SD_BEGIN.format(name=path.name))
         if ack.lower().startswith("error"):
             raise RuntimeError(ack)
 
-        # Stream file line-by-line
+        # Stream file line-by-line, *window* lines in flight
         try:
-            with path.open("r", encoding="utf-8", errors="ignore") as fp:
-                for line in fp:
-                    # Firmware limit ≈128 chars
-                    resp = await self.send(line.rstrip()[:127])
-                    if resp.lower().startswith("error"):
-                        raise RuntimeError(resp)
+            with path.open("rb") as fp:
+                batch: list[bytes] = []
+                for raw in fp:
+                    line = raw.strip()[:127]  # Firmware limit ≈128 chars
+                    if not line:
+                        continue  # blank lines are never acknowledged
+                    batch.append(line + b"\r\n")
+                    if len(batch) == window:
+                        await self._flush_window(batch)
+                        batch = []
+                if batch:
+                    await self._flush_window(batch)
         finally:
-            await self.send(self.GCodes.SD_END)
+            await self._end_upload()
+
+    async def _end_upload(self) -> None:
+        """Send ``M29`` on the connection that opened the M28 session.
+
+        Goes around :py:meth:`_write` on purpose: after a drop, a reconnect
+        would close a session that no longer exists.
+        """
+        if not self._healthy or not self.writer:
+            logger.warning("Connection lost during upload, %s not sent",
+                           self.GCodes.SD_END.value)
+            return
+        self.writer.write(self._encode(self.GCodes.SD_END))
+        await self.writer.drain()
+        try:
+            await self._read_response()
+        except (asyncio.TimeoutError, ConnectionResetError):
+            self._healthy = False
+            logger.warning("No reply to %s", self.GCodes.SD_END.value)
 
     # ---------------------------------------------------------------------
     # Print-control helpers
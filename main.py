@@ -5,9 +5,9 @@ from __future__ import annotations
 
 import asyncio
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.staticfiles import StaticFiles
 
 from core import models
@@ -23,6 +23,55 @@ from api import printers, web
 PRINTER_HOST = os.environ.get("PRINTER_HOST", "192.168.4.1")
 PRINTER_PORT = int(os.environ.get("PRINTER_PORT", 8080))
 POLL_INTERVAL = float(os.environ.get("POLL_INTERVAL", 0.5))
+STATIC_MAX_AGE = int(os.environ.get("STATIC_MAX_AGE", 86400))  # seconds
+
+# ---------------------------------------------------------------------------
+# Static files with browser caching
+# ---------------------------------------------------------------------------
+
+class CachedStaticFiles(StaticFiles):
+    """``StaticFiles`` that lets browsers keep assets for ``STATIC_MAX_AGE``.
+
+    Starlette already sends ETag / Last-Modified, so a stale asset is
+    revalidated with a cheap ``304``.
+    """
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers.setdefault("Cache-Control", f"public, max-age={STATIC_MAX_AGE}")
+        return response
+
+# ---------------------------------------------------------------------------
+# Background polling
+# ---------------------------------------------------------------------------
+
+async def _poll_loop(fastapi_app: FastAPI) -> None:
+    """
+    Poll the shared printer every ``POLL_INTERVAL`` seconds and push each
+    fresh snapshot to the WebSocket / SSE subscribers (see api/web.py).
+
+    Printer traffic stays constant no matter how many dashboards are open.
+    Every subscriber queue holds a single item: a slow client only ever
+    receives the most recent snapshot.
+    """
+    printer: MKSPrinter = fastapi_app.state.printer
+    lock: asyncio.Lock = fastapi_app.state.printer_lock
+    subscribers: set[asyncio.Queue] = fastapi_app.state.status_subscribers
+    while True:
+        try:
+            async with lock:
+                snapshot = await printer.poll(seconds=0)
+        except Exception as exc:  # keep polling through printer hiccups
+            print(f"⚠️  poll failed: {exc}")
+            snapshot = {}
+
+        if snapshot:
+            for queue in subscribers:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(snapshot)
+
+        await asyncio.sleep(POLL_INTERVAL)
 
 # ---------------------------------------------------------------------------
 # Lifespan context manager
@@ -32,19 +81,38 @@ POLL_INTERVAL = float(os.environ.get("POLL_INTERVAL", 0.5))
 async def lifespan(fastapi_app: FastAPI):
     """
     Create one shared MKSPrinter and tear it down cleanly.
-    Automatically create database on startup
+    Automatically create database on startup and start the status poller.
     """
-    models.Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
     print("📦  DB ready")
     printer = MKSPrinter(PRINTER_HOST, PRINTER_PORT)
-    await printer.connect()
+    try:
+        await printer.connect()
+    except (OSError, asyncio.TimeoutError) as exc:
+        # not fatal: the driver reconnects on first use
+        print(f"⚠️  printer unreachable at startup: {exc}")
     fastapi_app.state.printer = printer
     fastapi_app.state.printer_lock = asyncio.Lock()
+    fastapi_app.state.status_subscribers = set()
+    fastapi_app.state.printer_cache = {}   # pid -> (host, port, MKSPrinter)
+    fastapi_app.state.printer_evictions = {}  # pid -> eviction count
+    fastapi_app.state.status_cache = {}    # pid -> (monotonic stamp, snapshot)
+    fastapi_app.state.status_inflight = {} # pid -> asyncio.Task running poll()
+    poller = asyncio.create_task(_poll_loop(fastapi_app))
     try:
         yield
     finally:
         print("👋  shutting down")
+        poller.cancel()
+        with suppress(asyncio.CancelledError):
+            await poller
         await printer.close()
+        for task in fastapi_app.state.status_inflight.values():
+            task.cancel()
+        for _host, _port, cached in fastapi_app.state.printer_cache.values():
+            await cached.close()
+        await engine.dispose()  # close pooled aiosqlite connections
 
 # ---------------------------------------------------------------------------
 # FastAPI application
@@ -66,4 +134,4 @@ app.include_router(printers.router)
 app.include_router(web.router)
 
 # Serve /static/* files (CSS & JS)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
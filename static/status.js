@@ -1,28 +1,19 @@
 /* ------------------------------------------------------------
-   Live-poll printer status and keep the last good data
+   Live printer status pushed by the server; keep the last good data
    ------------------------------------------------------------ */
 
    let lastData = {};          // snapshot of the latest complete state
 
-   async function refresh() {
-     try {
-       const resp = await fetch("/api/v1/printers/1/status");
-       if (!resp.ok) throw new Error(resp.statusText);
-       const incoming = await resp.json();
-   
-       /* -------- deep-merge: overwrite only keys that arrived -------- */
-       lastData = {
-         ...lastData,
-         ...incoming,                       // top-level keys
-         temps: {
-           ...(lastData.temps || {}),
-           ...(incoming.temps || {})        // per-temperature keys
-         }
-       };
-     } catch (err) {
-       // network error or server hiccup → keep displaying lastData
-       console.error("[poll error]", err);
-     }
+   function refresh(incoming) {
+     /* -------- deep-merge: overwrite only keys that arrived -------- */
+     lastData = {
+       ...lastData,
+       ...incoming,                       // top-level keys
+       temps: {
+         ...(lastData.temps || {}),
+         ...(incoming.temps || {})        // per-temperature keys
+       }
+     };
    
      /* ---------- render UI from lastData (never undefined) ---------- */
      const {
@@ -73,7 +64,34 @@
      else                           badge.classList.add("text-bg-secondary");
    }
    
+   /* --------------- transport: WebSocket, SSE fallback --------------- */
+   
+   function onMessage(event) {
+     try {
+       refresh(JSON.parse(event.data));
+     } catch (err) {
+       // malformed frame → keep displaying lastData
+       console.error("[status error]", err);
+     }
+   }
+   
+   function connectEvents() {
+     const source = new EventSource("/events/status");   // auto-reconnects
+     source.onmessage = onMessage;
+   }
+   
+   function connectSocket() {
+     const scheme = location.protocol === "https:" ? "wss" : "ws";
+     const ws = new WebSocket(`${scheme}://${location.host}/ws/status`);
+     let opened = false;
+     ws.onopen    = () => { opened = true; };
+     ws.onmessage = onMessage;
+     ws.onclose   = () => {
+       if (opened) setTimeout(connectSocket, 2000); // dropped → retry
+       else        connectEvents();                 // never worked → SSE
+     };
+   }
+   
    /* --------------- kick things off --------------- */
-   refresh();                // run once immediately
-   setInterval(refresh, 1000);  // then every second
-   
\ No newline at end of file
+   if ("WebSocket" in window) connectSocket();
+   else                       connectEvents();